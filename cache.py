@@ -0,0 +1,79 @@
+"""
+Response Cache: Content-addressed on-disk cache for Gemini results.
+Entries are stored as {RESUME_CACHE_DIR}/{namespace}/{sha256}.json (default dir: ./.cache).
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+import orjson
+
+CACHE_DIR = Path(os.getenv("RESUME_CACHE_DIR", ".cache"))
+_enabled = True
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn caching on or off for this process (see --no-cache)."""
+    global _enabled
+    _enabled = enabled
+
+
+def text_key(*parts: str) -> str:
+    """Cache key over the given strings (model name, schema version, content...)."""
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def file_sha256(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, streamed in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load(namespace: str, key: str) -> Optional[Any]:
+    """Return the cached value, or None on a miss (or when caching is disabled)."""
+    if not _enabled:
+        return None
+    try:
+        return orjson.loads((CACHE_DIR / namespace / f"{key}.json").read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def store(namespace: str, key: str, value: Any) -> None:
+    """Write a value through to the cache; failures only print a warning."""
+    if not _enabled:
+        return
+    path = CACHE_DIR / namespace / f"{key}.json"
+    try:
+        _atomic_write(path, orjson.dumps(value))
+    except OSError as e:
+        print(f"Warning: could not write cache entry {path}: {e}")
+
+
+def store_raw_text(text: str) -> Optional[str]:
+    """Write resume text once to {CACHE_DIR}/raw/{sha256}.txt and return the path.
+
+    Used by --include-raw, so it writes even when caching is disabled. Returns None
+    (with a warning) if the file can't be written.
+    """
+    path = CACHE_DIR / "raw" / f"{text_key(text)}.txt"
+    try:
+        if not path.exists():
+            _atomic_write(path, text.encode())
+    except OSError as e:
+        print(f"Warning: could not write raw text {path}: {e}")
+        return None
+    return str(path)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique temp name per writer, then atomic rename so readers never see partial files
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
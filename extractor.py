@@ -4,17 +4,23 @@ Uses structured output with Pydantic schemas for deterministic extraction.
 """
 
 import os
-import json
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 import google.generativeai as genai
 from dotenv import load_dotenv
+import cache
+from gemini_client import CachedPromptModel, drop_defaults
 
 load_dotenv()
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
+# Flash-lite is cheaper/faster for schema-bound extraction and doesn't "think" by default
+EXTRACTION_MODEL = "gemini-2.5-flash-lite"
+# Bump whenever the schema or prompt changes so stale cache entries are ignored
+SCHEMA_VERSION = "3"
 
-# Pydantic schemas for structured output
+
+# Documented reference schemas (field meanings); not sent to Gemini
 class Experience(BaseModel):
     job_title: str = Field(description="Job title/role")
     company: str = Field(description="Company name")
@@ -42,22 +48,43 @@ class ResumeData(BaseModel):
     total_years_experience: float = Field(description="Total years of professional experience")
 
 
-def extract_structured_data(resume_text: str) -> Optional[dict]:
-    """Extract structured data from resume text using Gemini."""
-    try:
-        model = genai.GenerativeModel(
-            "gemini-2.5-flash",  # Using full flash model for better accuracy
-            generation_config=genai.GenerationConfig(
-                temperature=0,  # Deterministic
-                response_mime_type="application/json",
-                response_schema=ResumeData
-            )
-        )
-        
-        prompt = f"""You are a resume parser. Extract ALL information from this resume into structured JSON format.
-
-RESUME TEXT:
-{resume_text}
+# Production schemas: same fields without descriptions, which would otherwise be
+# serialized into every request's response_schema and billed as input tokens.
+# The SDK drops "required" from response schemas, so Gemini may omit any field;
+# missing fields get empty defaults instead of failing the whole resume.
+# Keys outside the schema are ignored.
+class _ExperienceFast(BaseModel):
+    model_config = ConfigDict(json_schema_extra=drop_defaults)
+    job_title: str = ""
+    company: str = ""
+    duration: str = ""
+    years: float = 0.0
+    responsibilities: list[str] = Field(default_factory=list)
+
+
+class _EducationFast(BaseModel):
+    model_config = ConfigDict(json_schema_extra=drop_defaults)
+    degree: str = ""
+    institution: str = ""
+    year: str = ""
+
+
+class _ResumeDataFast(BaseModel):
+    model_config = ConfigDict(json_schema_extra=drop_defaults)
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    location: str = ""
+    summary: str = ""
+    skills: list[str] = Field(default_factory=list)
+    experience: list[_ExperienceFast] = Field(default_factory=list)
+    education: list[_EducationFast] = Field(default_factory=list)
+    certifications: list[str] = Field(default_factory=list)
+    total_years_experience: float = 0.0
+
+
+# Shared by every resume, so it goes in the (context-cached) system instruction
+EXTRACTION_INSTRUCTIONS = """You are a resume parser. Extract ALL information from the resume you are given into structured JSON format.
 
 CRITICAL INSTRUCTIONS:
 1. Extract the candidate's name, email, phone, and location
@@ -78,16 +105,72 @@ IMPORTANT:
 
 Return the complete JSON object with ALL fields populated."""
 
-        response = model.generate_content(prompt)
+# One model per process, built on first use; the instructions are context-cached when
+# long enough for Gemini's caching minimum, otherwise sent as a system instruction
+_MODEL = CachedPromptModel(
+    EXTRACTION_MODEL,
+    EXTRACTION_INSTRUCTIONS,
+    generation_config=genai.GenerationConfig(
+        temperature=0,  # Deterministic
+        response_mime_type="application/json",
+        response_schema=_ResumeDataFast
+    )
+)
+
+
+def build_extraction_prompt(resume_text: str) -> str:
+    """Build the per-resume part of the extraction prompt."""
+    return f"""RESUME TEXT:
+{resume_text}"""
+
+
+def _cache_key(resume_text: str) -> str:
+    return cache.text_key(EXTRACTION_MODEL, SCHEMA_VERSION, resume_text)
+
+
+def _parse_response(cache_key: str, response) -> Optional[dict]:
+    """Validate a Gemini response against the schema and cache the result."""
+    if response.text:
+        # Parse and validate in one pass (pydantic-core)
+        result = _ResumeDataFast.model_validate_json(response.text).model_dump()
+        cache.store("extract", cache_key, result)
+        return result
+    return None
+
+
+def _report_error(e: Exception) -> None:
+    print(f"Error extracting structured data: {e}")
+    import traceback
+    traceback.print_exc()
+
+
+async def extract_structured_data_async(resume_text: str) -> Optional[dict]:
+    """Extract structured data from resume text using Gemini."""
+    try:
+        cache_key = _cache_key(resume_text)
+        if (cached := cache.load("extract", cache_key)) is not None:
+            return cached
         
-        if response.text:
-            result = json.loads(response.text)
-            return result
-        return None
+        prompt = build_extraction_prompt(resume_text)
+        response = await _MODEL.generate_content_async(prompt)
+        return _parse_response(cache_key, response)
         
     except Exception as e:
-        print(f"Error extracting structured data: {e}")
-        import traceback
-        traceback.print_exc()
+        _report_error(e)
         return None
 
+
+def extract_structured_data(resume_text: str) -> Optional[dict]:
+    """Blocking variant of extract_structured_data_async for non-async callers."""
+    try:
+        cache_key = _cache_key(resume_text)
+        if (cached := cache.load("extract", cache_key)) is not None:
+            return cached
+        
+        prompt = build_extraction_prompt(resume_text)
+        response = _MODEL.generate_content(prompt)
+        return _parse_response(cache_key, response)
+        
+    except Exception as e:
+        _report_error(e)
+        return None
@@ -0,0 +1,189 @@
+"""
+Gemini Client Helpers: Shared retry policy and prompt caching for Gemini API calls.
+Transient failures (rate limits, timeouts, 5xx) are retried with exponential backoff.
+"""
+
+import asyncio
+import atexit
+import datetime
+import threading
+import weakref
+from typing import Optional
+import google.generativeai as genai
+from google.generativeai import caching
+from google.api_core import exceptions as google_exceptions
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+# Gemini handles ~10 concurrent requests comfortably; retries cover the occasional 429
+MAX_CONCURRENT_REQUESTS = 10
+
+# Gemini only caches prompts of >= 1024 tokens; ~4 chars/token is a close enough estimate
+# to skip cache creation calls that are bound to be rejected
+MIN_CACHE_CHARS = 1024 * 4
+CACHE_TTL = datetime.timedelta(hours=1)
+
+# Errors worth retrying: 429 rate limits, timeouts and transient server errors
+TRANSIENT_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    TimeoutError,
+)
+
+# Up to 3 attempts with exponential backoff; the last error is re-raised as-is
+gemini_retry = retry(
+    wait=wait_random_exponential(multiplier=1, max=20),
+    stop=stop_after_attempt(3),
+    retry=retry_if_exception_type(TRANSIENT_ERRORS),
+    reraise=True,
+)
+
+
+# One semaphore per event loop (a semaphore can't be shared across asyncio.run calls)
+_request_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def request_slots() -> asyncio.Semaphore:
+    """Semaphore capping in-flight async Gemini requests on the running loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _request_slots:
+        _request_slots[loop] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return _request_slots[loop]
+
+
+# Long-lived loop for blocking callers; see run_sync
+_sync_loop = None
+_sync_loop_lock = threading.Lock()
+
+
+def run_sync(coro):
+    """Run a coroutine from blocking code on one long-lived background event loop.
+
+    The SDK's async gRPC client is bound to the first loop it's used on, so blocking
+    wrappers can't each start a fresh loop with asyncio.run.
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="gemini-sync-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
+
+
+def plain_int_enums(schema: dict) -> None:
+    """Pydantic json_schema_extra hook: drop integer enums from a model's response schema.
+
+    Gemini's Schema only accepts string enums, so Literal[0, 40, ...] fields are sent as
+    plain integers and the allowed values are enforced when validating the response.
+    """
+    for prop in schema.get("properties", {}).values():
+        if prop.get("type") == "integer":
+            prop.pop("enum", None)
+
+
+def drop_defaults(schema: dict) -> None:
+    """Pydantic json_schema_extra hook: drop field defaults from a model's response schema.
+
+    Gemini's Schema has no "default"; defaults only apply when validating the response.
+    """
+    for prop in schema.get("properties", {}).values():
+        prop.pop("default", None)
+
+
+@gemini_retry
+def generate_content(model, contents, **kwargs):
+    """Call model.generate_content, retrying transient errors."""
+    return model.generate_content(contents, **kwargs)
+
+
+@gemini_retry
+async def generate_content_async(model, contents, **kwargs):
+    """Async generate_content, retrying transient errors and respecting the request limit."""
+    async with request_slots():
+        return await model.generate_content_async(contents, **kwargs)
+
+
+class CachedPromptModel:
+    """GenerativeModel whose shared system prompt is stored via Gemini context caching.
+
+    Each request then only sends the per-resume part. Prompts below the caching
+    minimum, or a failed cache creation, fall back to a plain system instruction.
+    The model is built lazily on first use, so importing a module makes no API calls.
+    """
+    
+    def __init__(self, model_name: str, system_instruction: str, generation_config=None):
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.generation_config = generation_config
+        self._lock = threading.Lock()
+        self._model: Optional[genai.GenerativeModel] = None
+        self._cached: Optional[caching.CachedContent] = None
+    
+    def get(self) -> genai.GenerativeModel:
+        with self._lock:
+            if self._model is None:
+                self._model = self._build()
+            return self._model
+    
+    async def get_async(self) -> genai.GenerativeModel:
+        """get() for coroutines: the first build (a blocking cache-creation call) runs in a thread."""
+        if (model := self._model) is not None:
+            return model
+        return await asyncio.to_thread(self.get)
+    
+    def invalidate(self):
+        """Drop the current model so the next call recreates the cache."""
+        with self._lock:
+            self._model = None
+            self._cached = None
+    
+    def _build(self) -> genai.GenerativeModel:
+        if len(self.system_instruction) >= MIN_CACHE_CHARS:
+            try:
+                cached = caching.CachedContent.create(
+                    model=self.model_name,
+                    system_instruction=self.system_instruction,
+                    ttl=CACHE_TTL
+                )
+                self._cached = cached
+                atexit.register(_delete_quietly, cached)
+                return genai.GenerativeModel.from_cached_content(
+                    cached, generation_config=self.generation_config
+                )
+            except Exception as e:
+                print(f"Warning: context caching unavailable, sending full prompt: {e}")
+        
+        return genai.GenerativeModel(
+            self.model_name,
+            system_instruction=self.system_instruction,
+            generation_config=self.generation_config
+        )
+    
+    def generate_content(self, contents, **kwargs):
+        """Generate with retries; an expired/deleted prompt cache is recreated once."""
+        try:
+            return generate_content(self.get(), contents, **kwargs)
+        except google_exceptions.NotFound:
+            if self._cached is None:
+                raise
+            self.invalidate()
+            return generate_content(self.get(), contents, **kwargs)
+    
+    async def generate_content_async(self, contents, **kwargs):
+        """Async variant of generate_content."""
+        try:
+            return await generate_content_async(await self.get_async(), contents, **kwargs)
+        except google_exceptions.NotFound:
+            if self._cached is None:
+                raise
+            self.invalidate()
+            return await generate_content_async(await self.get_async(), contents, **kwargs)
+
+
+def _delete_quietly(cached_content):
+    """Delete a prompt cache at exit instead of paying for it until the TTL runs out."""
+    try:
+        cached_content.delete()
+    except Exception:
+        pass
@@ -6,9 +6,12 @@ Full pipeline: Parse → Extract → Score → Rank → Display
 
 import argparse
 import os
-import json
-from parser import parse_resume
-from extractor import extract_structured_data
+import asyncio
+from pathlib import Path
+import orjson
+import cache
+from parser import has_meaningful_text, parse_resume
+from extractor import extract_structured_data_async
 from scorer import ResumeScorer
 from job_constants import JOB_DESCRIPTION
 
@@ -19,6 +22,11 @@ def get_args():
     )
     parser.add_argument("--files", nargs="*", help="Explicit resume file paths")
     parser.add_argument("--folder", help="Folder containing resume files")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore and don't write the on-disk Gemini response cache")
+    parser.add_argument("--include-raw", action="store_true",
+                        help="Save each resume's extracted text under the cache dir and "
+                             "reference it as raw_text_path in the results")
     return parser.parse_args()
 
 
@@ -43,50 +51,58 @@ def collect_resume_files(args):
             print("Error: Invalid folder path.")
             return []
 
-        resume_files = []
-        for fname in sorted(os.listdir(args.folder)):
-            if fname.lower().endswith(valid_ext):
-                full_path = os.path.join(args.folder, fname)
-                if os.path.isfile(full_path):
-                    resume_files.append(full_path)
-                    if len(resume_files) == 10:
-                        break
-        return resume_files
+        # scandir entries carry their file type, so no extra stat() per file
+        with os.scandir(args.folder) as it:
+            entries = sorted(
+                (e for e in it if e.name.lower().endswith(valid_ext) and e.is_file()),
+                key=lambda e: e.name
+            )
+        return [e.path for e in entries[:10]]
 
     print("Error: Provide either --files or --folder")
     return []
 
 
-def process_resume(file_path: str, scorer: ResumeScorer) -> dict:
-    """Process a single resume through the full pipeline."""
-    print(f"\nProcessing: {os.path.basename(file_path)}:")
-    
-    # Step 1: Parse (extract text)
-    print("Extracting text...")
-    text = parse_resume(file_path)
-    if not text:
-        print("Failed to extract text!!")
-        return None
-    print(f"Extracted {len(text)} characters")
-    
-    # Step 2: Extract structured data
-    print("Converting data to structured format")
-    structured = extract_structured_data(text)
-    if not structured:
-        print("Failed to extract structured data!!")
-        return None
-    print(f"Extracted data for: {structured.get('name', 'Unknown')}")
-    
-    # Step 3: Score
-    print("Calculating score...")
-    score_result = scorer.score(structured)
-    print(f"Score: {score_result['total_score']}")
-    
-    return {
-        "file_path": file_path,
-        "file_name": os.path.basename(file_path),
-        **score_result
-    }
+async def process_resume_async(file_path: str, scorer: ResumeScorer, include_raw: bool = False) -> dict:
+    """Process a single resume through the full pipeline.
+
+    Progress lines are buffered and printed together so output from
+    resumes processed concurrently doesn't interleave.
+    """
+    log = [f"\nProcessing: {os.path.basename(file_path)}:"]
+    try:
+        # Step 1: Parse (extract text); disk reads and the OCR fallback block, so use a thread
+        log.append("Extracting text...")
+        text = await asyncio.to_thread(parse_resume, file_path)
+        if not has_meaningful_text(text):
+            log.append("Failed to extract text!!")
+            return None
+        log.append(f"Extracted {len(text)} characters")
+        
+        # Step 2: Extract structured data
+        log.append("Converting data to structured format")
+        structured = await extract_structured_data_async(text)
+        if not structured:
+            log.append("Failed to extract structured data!!")
+            return None
+        log.append(f"Extracted data for: {structured.get('name', 'Unknown')}")
+        
+        # Step 3: Score
+        log.append("Calculating score...")
+        score_result = await scorer.score_async(structured)
+        log.append(f"Score: {score_result['total_score']}")
+        
+        result = {
+            "file_path": file_path,
+            "file_name": os.path.basename(file_path),
+            **score_result
+        }
+        # Raw text is never embedded in the results, only referenced by path
+        if include_raw:
+            result["raw_text_path"] = cache.store_raw_text(text)
+        return result
+    finally:
+        print("\n".join(log))
 
 
 def display_rankings(results: list):
@@ -114,12 +130,13 @@ def display_rankings(results: list):
         print()
         
 
-def main():
+async def main_async():
     """Main execution flow."""
     print("RESUME RANKING SYSTEM")
     
     # Get files
     args = get_args()
+    cache.set_enabled(not args.no_cache)
     resume_files = collect_resume_files(args)
     
     if not resume_files:
@@ -134,14 +151,19 @@ def main():
     # Initialize scorer
     scorer = ResumeScorer(JOB_DESCRIPTION)
     
-    # Process all resumes
+    # Process all resumes on one event loop; Gemini calls are capped by a shared semaphore
+    outcomes = await asyncio.gather(
+        *(process_resume_async(f, scorer, args.include_raw) for f in resume_files),
+        return_exceptions=True
+    )
     results = []
-    for file_path in resume_files:
-        result = process_resume(file_path, scorer)
-        if result:
-            results.append(result)
+    for file_path, outcome in zip(resume_files, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"Error processing {os.path.basename(file_path)}: {outcome}")
+        elif outcome:
+            results.append(outcome)
     
-    # Sort by score (descending)
+    # Sort by score (descending); sort is stable so ties keep input order
     results.sort(key=lambda x: x['total_score'], reverse=True)
     
     # Display rankings
@@ -150,13 +172,17 @@ def main():
         
         # Save to JSON
         output_file = "ranking_results.json"
-        with open(output_file, 'w') as f:
-            json.dump(results, indent=2, fp=f)
+        Path(output_file).write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
         print(f"\n{'='*80}")
         print(f"Results saved to: {output_file}")
     else:
         print("\nNo resumes were successfully processed.")
 
 
+def main():
+    """Entry point: run the async pipeline on a single event loop."""
+    asyncio.run(main_async())
+
+
 if __name__ == "__main__":
     main()
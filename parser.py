@@ -1,34 +1,86 @@
 """
 Resume Parser Module: Extracts text from PDF and DOCX files.
-Uses pdfplumber (PDF), python-docx (DOCX), and Gemini 2.5 Flash (OCR fallback).
+Uses pdfplumber (PDF), lxml over the raw DOCX XML, and Gemini 2.5 Flash (OCR fallback).
 """
 
+import io
 import os
-from typing import Optional
+import zipfile
+from typing import Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor
 import pdfplumber
-from docx import Document
+from lxml import etree
 import google.generativeai as genai
 from dotenv import load_dotenv
+import cache
+from gemini_client import MAX_CONCURRENT_REQUESTS, gemini_retry
 
 load_dotenv()
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
+OCR_MODEL = "gemini-2.5-flash"
+# Inline request payloads are capped at 20 MB; keep some headroom for the prompt
+MAX_INLINE_PDF_BYTES = 19 * 1024 * 1024
+# Below this many letters a text is treated as empty (not worth a structured-extraction call)
+MIN_TEXT_ALPHA_CHARS = 100
 
-def extract_text_from_pdf_with_gemini(file_path: str) -> Optional[str]:
+# WordprocessingML namespace used by every element in word/document.xml
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_W = f"{{{_W_NS}}}"
+# The runs python-docx reads: direct children and hyperlink runs, not text-box content
+# (which Word stores twice, in mc:Choice and mc:Fallback)
+_PARAGRAPH_RUNS = etree.XPath("./w:r | ./w:hyperlink/w:r", namespaces={"w": _W_NS})
+
+
+def has_meaningful_text(text: Optional[str]) -> bool:
+    """True if text has at least MIN_TEXT_ALPHA_CHARS letters (roughly one sentence)."""
+    return bool(text) and sum(c.isalpha() for c in text) >= MIN_TEXT_ALPHA_CHARS
+
+
+def iter_extract_text_from_pdf_with_gemini(file_path: str) -> Iterator[str]:
+    """Stream OCR text for a PDF from Gemini, yielding chunks as they arrive."""
+    # print(f"  → Using Gemini 2.5 Flash for OCR...")
+    model = genai.GenerativeModel(OCR_MODEL)
+    
+    # Small PDFs go inline with the request; only large ones need the Files API round-trips
+    uploaded_file = None
+    if os.path.getsize(file_path) > MAX_INLINE_PDF_BYTES:
+        uploaded_file = gemini_retry(genai.upload_file)(file_path)
+        document = uploaded_file
+    else:
+        with open(file_path, "rb") as f:
+            document = {"mime_type": "application/pdf", "data": f.read()}
+    
+    prompt = "Extract ALL text content from this resume document. Return ONLY the raw text."
+    
     try:
-        # print(f"  → Using Gemini 2.5 Flash for OCR...")
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        uploaded_file = genai.upload_file(file_path)
-        
-        prompt = "Extract ALL text content from this resume document. Return ONLY the raw text."
-        
         response = model.generate_content(
-            [uploaded_file, prompt],
-            generation_config=genai.GenerationConfig(temperature=0)
+            [document, prompt],
+            generation_config=genai.GenerationConfig(temperature=0),
+            stream=True
         )
+        for chunk in response:
+            if chunk.parts:
+                yield chunk.text
+    finally:
+        if uploaded_file:
+            uploaded_file.delete()
+
+
+def extract_text_from_pdf_with_gemini(file_path: str) -> Optional[str]:
+    try:
+        # Same file bytes -> same OCR output; skip Gemini on reruns
+        cache_key = cache.text_key(OCR_MODEL, cache.file_sha256(file_path))
+        if (cached := cache.load("ocr", cache_key)) is not None:
+            return cached
+        
+        # Retry the whole stream: a transient error mid-stream leaves a partial text
+        text = gemini_retry(lambda: "".join(iter_extract_text_from_pdf_with_gemini(file_path)))().strip()
+        if not text:
+            return None
         
-        uploaded_file.delete()
-        return response.text.strip() if response.text else None
+        cache.store("ocr", cache_key, text)
+        return text
         
     except Exception as e:
         print(f"  Error with Gemini OCR: {e}")
@@ -37,14 +89,19 @@ def extract_text_from_pdf_with_gemini(file_path: str) -> Optional[str]:
 
 def extract_text_from_pdf(file_path: str) -> Optional[str]:
     try:
-        text_content = []
+        buf = io.StringIO()
         with pdfplumber.open(file_path) as pdf:
             for page in pdf.pages:
                 if (page_text := page.extract_text()):
-                    text_content.append(page_text)
+                    if buf.tell():
+                        buf.write("\n")
+                    buf.write(page_text)
+                # Drop this page's cached chars/lines/rects before moving on
+                page.flush_cache()
         
-        if text_content:
-            return "\n".join(text_content)
+        # Some scanned PDFs have a text layer of just whitespace/control chars; OCR those
+        if has_meaningful_text(text := buf.getvalue().strip()):
+            return text
         
         # print(f"No text layer found, falling back to Gemini OCR...")
         return extract_text_from_pdf_with_gemini(file_path)
@@ -54,15 +111,41 @@ def extract_text_from_pdf(file_path: str) -> Optional[str]:
         return extract_text_from_pdf_with_gemini(file_path)
 
 
+def _paragraph_text(paragraph) -> str:
+    """Text of a <w:p> element, like python-docx: only run content, tabs and line breaks kept.
+
+    Run children are read directly so tab-stop definitions in <w:pPr> add no tabs.
+    """
+    parts = []
+    for run in _PARAGRAPH_RUNS(paragraph):
+        for el in run.iterchildren():
+            tag = el.tag
+            if tag == f"{_W}t":
+                parts.append(el.text or "")
+            elif tag in (f"{_W}tab", f"{_W}ptab"):
+                parts.append("\t")
+            elif tag == f"{_W}cr" or (tag == f"{_W}br" and el.get(f"{_W}type", "textWrapping") == "textWrapping"):
+                # Page and column breaks have no text, like python-docx
+                parts.append("\n")
+            elif tag == f"{_W}noBreakHyphen":
+                parts.append("-")
+    return "".join(parts)
+
+
 def extract_text_from_docx(file_path: str) -> Optional[str]:
     """Extract text from DOCX files (paragraphs and tables)."""
     try:
-        doc = Document(file_path)
-        text_content = [p.text for p in doc.paragraphs if p.text.strip()]
+        with zipfile.ZipFile(file_path) as z:
+            body = etree.fromstring(z.read("word/document.xml")).find(f"{_W}body")
+        
+        paragraphs = (_paragraph_text(p) for p in body.iterfind(f"{_W}p"))
+        text_content = [text for text in paragraphs if text.strip()]
         
-        for table in doc.tables:
-            for row in table.rows:
-                row_text = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+        for table in body.iterfind(f"{_W}tbl"):
+            for row in table.iterfind(f"{_W}tr"):
+                cells = ("\n".join(_paragraph_text(p) for p in cell.iterfind(f"{_W}p")).strip()
+                         for cell in row.iterfind(f"{_W}tc"))
+                row_text = [text for text in cells if text]
                 if row_text:
                     text_content.append(" | ".join(row_text))
             
@@ -90,12 +173,16 @@ def parse_resume(file_path: str) -> Optional[str]:
 
 
 def parse_resumes(file_paths: list) -> dict:
-    """Batch process list of resume files."""
-    results = {}
-    for file_path in file_paths:
+    """Batch process list of resume files concurrently (OCR fallbacks overlap)."""
+    if not file_paths:
+        return {}
+    
+    def parse_one(file_path: str) -> Optional[str]:
         print(f"Parsing: {os.path.basename(file_path)}...")
-        results[file_path] = parse_resume(file_path)
-    return results
+        return parse_resume(file_path)
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(file_paths))) as executor:
+        return dict(zip(file_paths, executor.map(parse_one, file_paths)))
 
 
 if __name__ == "__main__":
@@ -4,50 +4,159 @@ Uses Gemini 2.5 Flash with temperature=0 and strict enum output.
 """
 
 import os
+import re
+import sys
 import json
-from typing import Dict, List, Any, Tuple
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Literal, Optional, FrozenSet, Tuple, Type, Union
+from pydantic import BaseModel, ConfigDict
 import google.generativeai as genai
 from dotenv import load_dotenv
+import cache
+from gemini_client import CachedPromptModel, plain_int_enums, run_sync
 
-# Load env and configure Gemini (only once)
+# Load env and configure Gemini once at import
 load_dotenv()
-_gemini_configured = False
+genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
-def ensure_gemini_configured():
-    """Configure Gemini API only if not already configured."""
-    global _gemini_configured
-    if not _gemini_configured:
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        _gemini_configured = True
 
+SCORING_MODEL = "gemini-2.5-flash-lite"
+# Bump when the skills prompt changes so stale disk-cache entries are ignored
+SKILLS_PROMPT_VERSION = "2"
+# Fused results are keyed on the full prompt; bump this when their format or parsing changes
+FUSED_RESULT_VERSION = "1"
 
-def match_skills_with_llm(candidate_skills: List[str], required_skills: List[str]) -> Tuple[List[str], str]:
+# Fallback relevance check: any of these (case-insensitive, substring) in a job title
+_RELEVANCE_RE = re.compile(
+    r"software|developer|engineer|programmer|full-stack|fullstack|backend|frontend|web|devops|architect",
+    re.IGNORECASE
+)
 
-    if not candidate_skills or not required_skills:
-        return [], "No skills to match"
-    
-    ensure_gemini_configured()
+# Fallback education tiers: degree keyword -> (score, note), matched in one regex pass
+_EDUCATION_TIERS = {
+    'computer science': (100.0, "CS/SE degree (fallback)"),
+    'software engineering': (100.0, "CS/SE degree (fallback)"),
+    'information technology': (80.0, "Related degree (fallback)"),
+    'data science': (80.0, "Related degree (fallback)"),
+}
+_EDUCATION_RE = re.compile("|".join(map(re.escape, _EDUCATION_TIERS)))
+
+# Skill matches memoized per (sorted lowercased candidate skills, required skills), shared by
+# every ResumeScorer for the same job
+SkillKey = Tuple[str, ...]
+SKILL_MATCH_CACHE_SIZE = 4096
+# LRU: hits move to the end, the least recently used entry is evicted first
+_skill_match_memo: "OrderedDict[Tuple[SkillKey, SkillKey], Tuple[List[str], str]]" = OrderedDict()
+_skill_match_inflight: Dict[Tuple[SkillKey, SkillKey], asyncio.Future] = {}
+
+
+# Response schemas; the Literal scores make out-of-rubric answers fail validation
+class SkillMatch(BaseModel):
+    matched_skills: list[str]
+    reasoning: str
+
+
+class RelevanceScore(BaseModel):
+    model_config = ConfigDict(json_schema_extra=plain_int_enums)
+    score: Literal[0, 40, 60, 80, 100]
+    reasoning: str
+
+
+class EducationScore(BaseModel):
+    model_config = ConfigDict(json_schema_extra=plain_int_enums)
+    score: Literal[100, 80, 60, 40, 30]
+    reasoning: str
+
+
+class CombinedScoreResult(BaseModel):
+    skills: SkillMatch
+    relevance: RelevanceScore
+    education: EducationScore
+
+
+# response_schema per model key
+_RESPONSE_SCHEMAS = {
+    "skills": SkillMatch,
+    "relevance": RelevanceScore,
+    "education": EducationScore,
+    "combined": CombinedScoreResult,
+}
+
+
+def _generation_config(schema_key: str) -> genai.GenerationConfig:
+    return genai.GenerationConfig(
+        temperature=0,
+        response_mime_type="application/json",
+        response_schema=_RESPONSE_SCHEMAS[schema_key]
+    )
+
+
+def _score_skills(matched: List[str], required: List[str]) -> Tuple[float, List[str]]:
+    """Skills score (% of required skills matched) and the required skills still missing."""
+    matched_set = set(matched)
+    missing = [s for s in required if s not in matched_set]
+    return (len(matched) / len(required)) * 100, missing
+
+
+# Order of the LLM-backed dimensions returned by ResumeScorer._score_llm_dimensions
+_DIMENSIONS = ('skills', 'relevance', 'education')
+
+
+def _rubric_score(schema: Type[Union[RelevanceScore, EducationScore]], part: Dict[str, Any]) -> Tuple[float, str]:
+    """(score, reasoning) from one rubric object of a fused response, validated against schema."""
+    result = schema.model_validate(part)
+    return float(result.score), result.reasoning
+
+
+class ResumeScorer:
+    """Deterministic resume scoring with LLM-based skill matching."""
     
-    try:
-        model = genai.GenerativeModel(
-            "gemini-2.5-flash-lite",
-            generation_config=genai.GenerationConfig(
-                temperature=0,
-                response_mime_type="application/json",
-            )
-        )
+    def __init__(self, job_description: Dict[str, Any], max_concurrency: int = 20,
+                 fuse_llm_calls: bool = True, use_llm: bool = True) -> None:
+        self.jd: Dict[str, Any] = job_description
+        # Max candidates scored at once by score_batch (size to the Gemini rate-limit tier)
+        self.max_concurrency = max_concurrency
+        # One Gemini call for skills + relevance + education instead of three
+        self.fuse_llm_calls = fuse_llm_calls
+        # False skips Gemini and scores every dimension with its non-LLM fallback
+        self.use_llm = use_llm
+        self.job_title: str = job_description.get('title', '').lower()
+        self.required_experience: float = job_description.get('required_experience', 0)
+        # Interned so comparisons against matched skills are mostly pointer checks
+        self.required_skills: List[str] = [sys.intern(s.lower()) for s in job_description.get('required_skills', [])]
+        # Built from this scorer's own list so a copied JD with other skills can't go stale
+        self._req_skills: FrozenSet[str] = frozenset(self.required_skills)
+        self._req_key: SkillKey = tuple(self.required_skills)
         
+        # JD + rubric instructions per call type, sent once as a (context-cached) system prompt;
+        # each request then only carries the candidate's data
+        instructions = self._build_instructions()
+        self._models: Dict[str, CachedPromptModel] = {
+            key: CachedPromptModel(SCORING_MODEL, instructions[key], generation_config=_generation_config(key))
+            for key in _RESPONSE_SCHEMAS
+        }
+        
+        self.weights: Dict[str, int] = {
+            'skills': 45,
+            'experience': 30,
+            'relevance': 15,
+            'education': 10
+        }
+    
+    def _build_instructions(self) -> Dict[str, str]:
+        """System prompt per model key: everything that depends only on the job."""
+        title = self.jd.get('title', 'Unknown')
+        description = self.jd.get('description', 'Not provided')
+        required_json = json.dumps(self.required_skills)
         # Format required skills as explicit enum
-        required_skills_lower = [s.lower() for s in required_skills]
-        skills_enum = ", ".join([f'"{s}"' for s in required_skills_lower])
+        required_enum = ", ".join([f'"{s}"' for s in self.required_skills])
         
-        prompt = f"""You are a skill matching system. Analyze candidate skills and return which required skills they satisfy.
+        skills = f"""You are a skill matching system. Analyze candidate skills and return which required skills they satisfy.
 
 REQUIRED SKILLS (you can ONLY return skills from this exact list):
-{json.dumps(required_skills_lower)}
-
-CANDIDATE'S SKILLS:
-{json.dumps(candidate_skills)}
+{required_json}
 
 Rules:
 1. You can ONLY return skills that exist EXACTLY in the REQUIRED SKILLS list above
@@ -65,43 +174,165 @@ Return JSON in this EXACT format:
   "reasoning": "brief explanation"
 }}
 
-IMPORTANT: matched_skills array must ONLY contain values from this list: [{skills_enum}]"""
-
-        response = model.generate_content(prompt)
-        result = json.loads(response.text)
+IMPORTANT: matched_skills array must ONLY contain values from this list: [{required_enum}]"""
         
-        # Strict validation: only keep skills that exactly match required skills
-        matched_raw = result.get('matched_skills', [])
-        matched = [s for s in matched_raw if s.lower() in required_skills_lower]
-        reasoning = result.get('reasoning', '')
+        relevance = f"""You are a job relevance evaluator.
+
+TARGET JOB: {title}
+JOB DESCRIPTION: {description}
+
+Evaluate how relevant the candidate's work history is to the target job.
+
+Scoring guidelines:
+- 100: All roles directly relevant (e.g., all "Software Engineer" for Software Engineer role)
+- 80: Most roles relevant (e.g., 4/5 relevant)
+- 60: Some relevant experience (e.g., 2/5 relevant)
+- 40: Minimal relevant experience (e.g., 1/5 relevant)
+- 0: No relevant experience
+
+Return JSON in this EXACT format:
+{{
+  "score": 80,
+  "reasoning": "brief explanation"
+}}
+
+IMPORTANT: Score must be 0, 40, 60, 80, or 100"""
         
-        return matched, reasoning
+        education = f"""You are an education relevance evaluator for job applications.
+
+JOB ROLE: {title}
+JOB DESCRIPTION: {description}
+
+Evaluate how relevant the candidate's education is to this specific job role.
+
+Scoring guidelines:
+- 100: Perfect match (e.g., CS degree for Software Engineer, MBA for Business Analyst)
+- 80: Closely related field (e.g., IT/Data Science for Software Engineer)
+- 60: Somewhat relevant technical/analytical background
+- 40: Has a degree but not directly relevant
+- 30: No education listed
+
+Return JSON in this EXACT format:
+{{
+  "score": 100,
+  "reasoning": "brief explanation of why this score"
+}}
+
+IMPORTANT: 
+- Score must be one of: 100, 80, 60, 40, or 30
+- Be consistent: same education + same job = same score every time"""
         
-    except Exception as e:
-        print(f"Error in LLM skill matching: {e}")
-        # Fallback to exact matching
-        candidate_lower = {s.lower() for s in candidate_skills}
-        required_lower = set(required_skills_lower)
-        return list(candidate_lower.intersection(required_lower)), "Fallback: exact match"
+        combined = f"""You are a resume scoring system. Evaluate the candidate against the target job on three separate criteria.
 
+TARGET JOB: {title}
+JOB DESCRIPTION: {description}
 
-class ResumeScorer:
-    """Deterministic resume scoring with LLM-based skill matching."""
+1. SKILLS: return which required skills the candidate satisfies.
+REQUIRED SKILLS (you can ONLY return skills from this exact list):
+{required_json}
+Rules:
+- You can ONLY return skills that exist EXACTLY in the REQUIRED SKILLS list above
+- A candidate skill satisfies a required skill if it's the same OR a related framework/tool:
+   - "Flask", "Django" → satisfies "python"
+   - "React Native", "TypeScript" → satisfies "javascript"  
+   - "PostgreSQL", "MySQL" → satisfies "sql"
+   - "EC2", "S3", "Lambda" → satisfies "aws"
+   - "GitHub", "GitLab" → satisfies "git"
+- Be strict but fair
+
+2. RELEVANCE: how relevant is the candidate's work history to the target job?
+Scoring guidelines:
+- 100: All roles directly relevant (e.g., all "Software Engineer" for Software Engineer role)
+- 80: Most roles relevant (e.g., 4/5 relevant)
+- 60: Some relevant experience (e.g., 2/5 relevant)
+- 40: Minimal relevant experience (e.g., 1/5 relevant)
+- 0: No relevant experience
+
+3. EDUCATION: how relevant is the candidate's education to this specific job role?
+Scoring guidelines:
+- 100: Perfect match (e.g., CS degree for Software Engineer, MBA for Business Analyst)
+- 80: Closely related field (e.g., IT/Data Science for Software Engineer)
+- 60: Somewhat relevant technical/analytical background
+- 40: Has a degree but not directly relevant
+- 30: No education listed
+
+Return JSON in this EXACT format:
+{{
+  "skills": {{"matched_skills": ["skill1", "skill2"], "reasoning": "brief explanation"}},
+  "relevance": {{"score": 80, "reasoning": "brief explanation"}},
+  "education": {{"score": 100, "reasoning": "brief explanation of why this score"}}
+}}
+
+IMPORTANT:
+- matched_skills array must ONLY contain values from this list: [{required_enum}]
+- Relevance score must be 0, 40, 60, 80, or 100
+- Education score must be one of: 100, 80, 60, 40, or 30
+- Be consistent: same candidate + same job = same scores every time"""
+        
+        return {"skills": skills, "relevance": relevance, "education": education, "combined": combined}
     
-    def __init__(self, job_description: Dict[str, Any]):
-        self.jd = job_description
-        self.job_title = job_description.get('title', '').lower()
-        self.required_experience = job_description.get('required_experience', 0)
-        self.required_skills = [s.lower() for s in job_description.get('required_skills', [])]
+    async def match_skills_with_llm(self, candidate_skills: List[str]) -> Tuple[List[str], str]:
+        """Match candidate skills against the required skills with Gemini, falling back to exact match.
+
+        Results are memoized (in memory and in the disk cache) on the normalised skill sets,
+        and concurrent identical requests share a single Gemini call.
+        """
+        if not candidate_skills or not self.required_skills:
+            return [], "No skills to match"
         
-        self.weights = {
-            'skills': 45,
-            'experience': 30,
-            'relevance': 15,
-            'education': 10
-        }
+        candidates = tuple(sorted({s.lower() for s in candidate_skills}))
+        if not self.use_llm:
+            return self._fallback_skills(candidates)
+        
+        try:
+            matched, reasoning = await self._match_skills_memoized(candidates)
+            return list(matched), reasoning
+            
+        except Exception as e:
+            print(f"Error in LLM skill matching: {e}")
+            return self._fallback_skills(candidates)
+    
+    def _fallback_skills(self, candidates: SkillKey) -> Tuple[List[str], str]:
+        # Fallback to exact matching
+        candidate_set = set(candidates)
+        return [s for s in self.required_skills if s in candidate_set], "Fallback: exact match"
     
-    def calculate_skills_score(self, candidate_skills: List[str]) -> Tuple[float, List[str], List[str], str]:
+    async def _match_skills_memoized(self, candidates: SkillKey) -> Tuple[List[str], str]:
+        key = (candidates, self._req_key)
+        if (hit := _skill_match_memo.get(key)) is not None:
+            _skill_match_memo.move_to_end(key)
+            return hit
+        
+        task = _skill_match_inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._match_skills_uncached(candidates))
+            _skill_match_inflight[key] = task
+            task.add_done_callback(lambda t: _skill_match_inflight.pop(key, None)
+                                   if _skill_match_inflight.get(key) is t else None)
+        # Shielded so one cancelled caller doesn't cancel the call others are waiting on
+        return await asyncio.shield(task)
+    
+    async def _match_skills_uncached(self, candidates: SkillKey) -> Tuple[List[str], str]:
+        disk_key = cache.text_key(SCORING_MODEL, "skills", SKILLS_PROMPT_VERSION, json.dumps([candidates, self._req_key]))
+        cached = cache.load("skills", disk_key)
+        
+        if cached is None:
+            prompt = f"CANDIDATE'S SKILLS:\n{json.dumps(list(candidates))}"
+            response = await self._models["skills"].generate_content_async(prompt)
+            parsed = SkillMatch.model_validate_json(response.text)
+            
+            # Strict validation: only keep skills that exactly match required skills
+            matched = [s.lower() for s in parsed.matched_skills if s.lower() in self._req_skills]
+            cached = [matched, parsed.reasoning]
+            cache.store("skills", disk_key, cached)
+        
+        entry: Tuple[List[str], str] = ([sys.intern(s) for s in cached[0]], cached[1])
+        if len(_skill_match_memo) >= SKILL_MATCH_CACHE_SIZE:
+            _skill_match_memo.popitem(last=False)
+        _skill_match_memo[(candidates, self._req_key)] = entry
+        return entry
+    
+    async def calculate_skills_score(self, candidate_skills: List[str]) -> Tuple[float, List[str], List[str], str]:
         """Calculate skills score using LLM matching with strict validation."""
         if not self.required_skills:
             return 100.0, [], [], "No skills required"
@@ -109,10 +340,8 @@ class ResumeScorer:
         if not candidate_skills:
             return 0.0, [], self.required_skills.copy(), "No skills provided"
         
-        matched, reasoning = match_skills_with_llm(candidate_skills, self.required_skills)
-        missing = [s for s in self.required_skills if s not in matched]
-        
-        score = (len(matched) / len(self.required_skills)) * 100
+        matched, reasoning = await self.match_skills_with_llm(candidate_skills)
+        score, missing = _score_skills(matched, self.required_skills)
         return score, matched, missing, reasoning
     
     def calculate_experience_score(self, years: float) -> Tuple[float, str]:
@@ -128,155 +357,189 @@ class ResumeScorer:
             return (years / req) * 100, f"{years:.1f}y (need {req}+)"
         return 100.0, f"{years:.1f}y (meets {req}+ req)"
     
-    def calculate_relevance_score(self, experience: List[Dict]) -> Tuple[float, str]:
+    async def calculate_relevance_score(self, experience: List[Dict[str, Any]]) -> Tuple[float, str]:
         """Calculate role relevance using LLM evaluation."""
         if not experience:
             return 0.0, "No work history"
-        
-        ensure_gemini_configured()
+        if not self.use_llm:
+            return self._fallback_relevance_score(experience)
         
         try:
-            model = genai.GenerativeModel(
-                "gemini-2.5-flash-lite",
-                generation_config=genai.GenerationConfig(
-                    temperature=0,
-                    response_mime_type="application/json",
-                )
-            )
-            
             job_titles = [exp.get('job_title', 'Unknown') for exp in experience]
-            
-            prompt = f"""You are a job relevance evaluator.
-
-TARGET JOB: {self.jd.get('title', 'Unknown')}
-JOB DESCRIPTION: {self.jd.get('description', 'Not provided')}
-
-CANDIDATE'S PAST JOB TITLES:
-{json.dumps(job_titles)}
-
-Evaluate how relevant the candidate's work history is to the target job.
-
-Scoring guidelines:
-- 100: All roles directly relevant (e.g., all "Software Engineer" for Software Engineer role)
-- 80: Most roles relevant (e.g., 4/5 relevant)
-- 60: Some relevant experience (e.g., 2/5 relevant)
-- 40: Minimal relevant experience (e.g., 1/5 relevant)
-- 0: No relevant experience
-
-Return JSON in this EXACT format:
-{{
-  "score": 80,
-  "reasoning": "brief explanation"
-}}
-
-IMPORTANT: Score must be 0, 40, 60, 80, or 100"""
-
-            response = model.generate_content(prompt)
-            result = json.loads(response.text)
-            
-            score = result.get('score', 0)
-            reasoning = result.get('reasoning', 'LLM evaluation')
-            
-            # Validate score
-            if score not in [0, 40, 60, 80, 100]:
-                score = 0
-            
-            return float(score), reasoning
+            prompt = f"CANDIDATE'S PAST JOB TITLES:\n{json.dumps(job_titles)}"
+            response = await self._models["relevance"].generate_content_async(prompt)
+            result = RelevanceScore.model_validate_json(response.text)
+            return float(result.score), result.reasoning
             
         except Exception as e:
             print(f"Error in LLM relevance scoring: {e}")
-            # Fallback to keyword matching
-            keywords = {'software', 'developer', 'engineer', 'programmer', 'full-stack',
-                       'fullstack', 'backend', 'frontend', 'web', 'devops', 'architect'}
-            relevant = sum(1 for exp in experience 
-                          if any(kw in exp.get('job_title', '').lower() for kw in keywords))
-            total = len(experience)
-            return (relevant / total) * 100 if total else 0, f"{relevant}/{total} relevant (fallback)"
+            return self._fallback_relevance_score(experience)
+    
+    def _fallback_relevance_score(self, experience: List[Dict[str, Any]]) -> Tuple[float, str]:
+        # Fallback to keyword matching
+        relevant = sum(1 for exp in experience if _RELEVANCE_RE.search(exp.get('job_title', '')))
+        total = len(experience)
+        return (relevant / total) * 100 if total else 0, f"{relevant}/{total} relevant (fallback)"
     
-    def calculate_education_score(self, education: List[Dict]) -> Tuple[float, str]:
+    async def calculate_education_score(self, education: List[Dict[str, Any]]) -> Tuple[float, str]:
         """Calculate education score using LLM-based relevance evaluation."""
         if not education:
             return 30.0, "No education listed"
-        
-        ensure_gemini_configured()
+        if not self.use_llm:
+            return self._fallback_education_score(education)
         
         try:
-            model = genai.GenerativeModel(
-                "gemini-2.5-flash-lite",
-                generation_config=genai.GenerationConfig(
-                    temperature=0,
-                    response_mime_type="application/json",
-                )
-            )
-            
             # Format education for prompt
             education_list = [
                 f"{edu.get('degree', 'Unknown')} from {edu.get('institution', 'Unknown')}"
                 for edu in education
             ]
             
-            prompt = f"""You are an education relevance evaluator for job applications.
+            prompt = f"CANDIDATE'S EDUCATION:\n{json.dumps(education_list)}"
+            response = await self._models["education"].generate_content_async(prompt)
+            result = EducationScore.model_validate_json(response.text)
+            return float(result.score), result.reasoning
+            
+        except Exception as e:
+            print(f"Error in LLM education scoring: {e}")
+            return self._fallback_education_score(education)
+    
+    def _fallback_education_score(self, education: List[Dict[str, Any]]) -> Tuple[float, str]:
+        # Fallback to simple check: best tier of the first degree that mentions any keyword
+        for edu in education:
+            hits = [_EDUCATION_TIERS[m.group()] for m in _EDUCATION_RE.finditer(edu.get('degree', '').lower())]
+            if hits:
+                return max(hits)
+        return 40.0, "Other degree (fallback)"
+    
+    def _build_fused_prompt(self, candidate_skills: List[str], experience: List[Dict[str, Any]],
+                            education: List[Dict[str, Any]]) -> str:
+        """Candidate part of the fused prompt; the three rubrics are in the system instruction."""
+        job_titles = [exp.get('job_title', 'Unknown') for exp in experience]
+        education_list = [
+            f"{edu.get('degree', 'Unknown')} from {edu.get('institution', 'Unknown')}"
+            for edu in education
+        ]
+        
+        return f"""CANDIDATE'S SKILLS:
+{json.dumps(sorted({s.lower() for s in candidate_skills}))}
 
-JOB ROLE: {self.jd.get('title', 'Unknown')}
-JOB DESCRIPTION: {self.jd.get('description', 'Not provided')}
+CANDIDATE'S PAST JOB TITLES:
+{json.dumps(job_titles)}
 
 CANDIDATE'S EDUCATION:
-{json.dumps(education_list)}
-
-Evaluate how relevant the candidate's education is to this specific job role.
+{json.dumps(education_list)}"""
+    
+    async def _score_fused(self, candidate_skills: List[str], experience: List[Dict[str, Any]],
+                           education: List[Dict[str, Any]]) -> List[Any]:
+        """Skills, relevance and education sub-scores from a single Gemini call.
 
-Scoring guidelines:
-- 100: Perfect match (e.g., CS degree for Software Engineer, MBA for Business Analyst)
-- 80: Closely related field (e.g., IT/Data Science for Software Engineer)
-- 60: Somewhat relevant technical/analytical background
-- 40: Has a degree but not directly relevant
-- 30: No education listed
+        Each part is validated on its own; a part that fails is returned as its exception.
+        Fully valid responses are written through to the disk cache, so reruns skip the call.
+        """
+        model = self._models["combined"]
+        prompt = self._build_fused_prompt(candidate_skills, experience, education)
+        disk_key = cache.text_key(SCORING_MODEL, "combined", FUSED_RESULT_VERSION, model.system_instruction, prompt)
+        cached = cache.load("combined", disk_key)
+        result = cached if cached is not None else json.loads((await model.generate_content_async(prompt)).text)
+        
+        parsers = {
+            'skills': self._parse_fused_skills,
+            'relevance': lambda part: _rubric_score(RelevanceScore, part),
+            'education': lambda part: _rubric_score(EducationScore, part),
+        }
+        # Each entry is that dimension's sub-score tuple, or the exception it failed with
+        parts: List[Any] = []
+        for key in _DIMENSIONS:
+            try:
+                parts.append(parsers[key](result[key]))
+            except Exception as e:
+                parts.append(e)
+        
+        if cached is None and not any(isinstance(part, Exception) for part in parts):
+            cache.store("combined", disk_key, result)
+        return parts
+    
+    def _parse_fused_skills(self, part: Dict[str, Any]) -> Tuple[float, List[str], List[str], str]:
+        skills = SkillMatch.model_validate(part)
+        # Same skills validation as the separate call
+        matched = [sys.intern(s.lower()) for s in skills.matched_skills if s.lower() in self._req_skills]
+        skills_score, missing = _score_skills(matched, self.required_skills)
+        return skills_score, matched, missing, skills.reasoning
+    
+    async def _score_llm_dimensions(self, skills: List[str], experience: List[Dict[str, Any]],
+                                    education: List[Dict[str, Any]]) -> List[Tuple]:
+        """Skills, relevance and education sub-scores: fused when every dimension needs the LLM.
 
-Return JSON in this EXACT format:
-{{
-  "score": 100,
-  "reasoning": "brief explanation of why this score"
-}}
+        Only the dimensions the fused call didn't deliver are scored separately, and each
+        separate call falls back to its non-LLM score on its own.
+        """
+        separate = (
+            lambda: self.calculate_skills_score(skills),
+            lambda: self.calculate_relevance_score(experience),
+            lambda: self.calculate_education_score(education),
+        )
+        results: List[Any] = [None] * len(separate)
+        
+        if self.use_llm and self.fuse_llm_calls and self.required_skills and skills and experience and education:
+            try:
+                results = await self._score_fused(skills, experience, education)
+            except Exception as e:
+                print(f"Error in fused LLM scoring, scoring dimensions separately: {e}")
+        
+        pending = []
+        for i, outcome in enumerate(results):
+            if isinstance(outcome, Exception):
+                print(f"Invalid {_DIMENSIONS[i]} result in fused LLM scoring, scoring it separately: {outcome}")
+            if outcome is None or isinstance(outcome, Exception):
+                pending.append(i)
+        for i, outcome in zip(pending, await asyncio.gather(*(separate[i]() for i in pending))):
+            results[i] = outcome
+        return results
+    
+    async def score_batch(self, resumes: List[Dict[str, Any]],
+                          max_concurrency: Optional[int] = None) -> List[Any]:
+        """Score many candidates on one event loop, at most max_concurrency at a time.
 
-IMPORTANT: 
-- Score must be one of: 100, 80, 60, 40, or 30
-- Be consistent: same education + same job = same score every time"""
+        Results are in input order; a candidate that failed is returned as its exception.
+        """
+        sem = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        
+        async def score_one(resume_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with sem:
+                return await self.score_async(resume_data)
+        
+        return await asyncio.gather(*(score_one(r) for r in resumes), return_exceptions=True)
+    
+    def score_batch_sync(self, resumes: List[Dict[str, Any]]) -> List[Any]:
+        """Blocking score_batch for non-async callers; results are in input order.
 
-            response = model.generate_content(prompt)
-            result = json.loads(response.text)
-            
-            score = result.get('score', 40)
-            reasoning = result.get('reasoning', 'LLM evaluation')
-            
-            # Validate score is one of allowed values
-            if score not in [100, 80, 60, 40, 30]:
-                score = 40  # Default fallback
-            
-            return float(score), reasoning
-            
-        except Exception as e:
-            print(f"Error in LLM education scoring: {e}")
-            # Fallback to simple check
-            for edu in education:
-                degree = edu.get('degree', '').lower()
-                if any(t in degree for t in ['computer science', 'software engineering']):
-                    return 100.0, "CS/SE degree (fallback)"
-                if any(t in degree for t in ['information technology', 'data science']):
-                    return 80.0, "Related degree (fallback)"
-            return 40.0, "Other degree (fallback)"
+        Without the LLM (use_llm=False, or no Gemini API key set) every sub-score is a
+        CPU-bound fallback that asyncio can't overlap, so candidates are then scored
+        across a process pool (one scorer per worker).
+        """
+        if self.use_llm and (os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")):
+            return run_sync(self.score_batch(resumes))
+        
+        with ProcessPoolExecutor(initializer=_worker_init, initargs=(self.jd, self.fuse_llm_calls)) as executor:
+            return list(executor.map(_worker_score, resumes, chunksize=8))
     
     def score(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate total weighted score."""
+        """Blocking wrapper around score_async for non-async callers."""
+        return run_sync(self.score_async(resume_data))
+    
+    async def score_async(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate total weighted score; the LLM-backed sub-scores share one call (or run concurrently)."""
         skills = resume_data.get('skills', [])
         years = resume_data.get('total_years_experience', 0)
         experience = resume_data.get('experience', [])
         education = resume_data.get('education', [])
         name = resume_data.get('name', 'Unknown')
         
-        skills_score, matched, missing, reasoning = self.calculate_skills_score(skills)
+        (skills_score, matched, missing, reasoning), (rel_score, rel_note), (edu_score, edu_note) = (
+            await self._score_llm_dimensions(skills, experience, education)
+        )
         exp_score, exp_note = self.calculate_experience_score(years)
-        rel_score, rel_note = self.calculate_relevance_score(experience)
-        edu_score, edu_note = self.calculate_education_score(education)
         
         total = (
             (skills_score * self.weights['skills'] / 100) +
@@ -306,3 +569,23 @@ IMPORTANT:
             }
         }
 
+
+# Per-process state for ResumeScorer.score_batch_sync's worker pool
+_worker_scorer: Optional[ResumeScorer] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _worker_init(job_description: Dict[str, Any], fuse_llm_calls: bool) -> None:
+    global _worker_scorer, _worker_loop
+    _worker_scorer = ResumeScorer(job_description, fuse_llm_calls=fuse_llm_calls, use_llm=False)
+    # One loop per worker instead of an asyncio.run per candidate
+    _worker_loop = asyncio.new_event_loop()
+
+
+def _worker_score(resume_data: Dict[str, Any]) -> Any:
+    assert _worker_scorer is not None and _worker_loop is not None, "worker not initialized"
+    # Failures are returned, not raised, to match score_batch_sync's LLM path
+    try:
+        return _worker_loop.run_until_complete(_worker_scorer.score_async(resume_data))
+    except Exception as e:
+        return e